@@ -1,14 +1,24 @@
 import threading
 import queue
+import collections
 import time
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
-from PyPDF2 import PdfReader
+import pypdfium2 as pdfium
 from piper.voice import PiperVoice
+from piper.config import PiperConfig
+import onnxruntime
 import os
+import re
+import hashlib
+import json
+from pathlib import Path
 from tqdm import tqdm
 import logging
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 
 
 """
@@ -25,6 +35,8 @@ import logging
 3. Uneven gaps between sentences
    - Cause: Miscalculation of gap times; backpressure sleep accumulated; not accounting for synthesis & playback durations.
    - Resolution: Added precise logging of perf_counter at key points; computed gaps as differences between actual playback end and next start; frame sleep adjusted correctly.
+   - Sentence pause is now `sentence_gap` seconds of zeros written by the audio callback (no time.sleep),
+     and gaps are logged from the callback's sample count, i.e. what was actually played.
 
 4. Exit / stop / stuck issues
    - Cause: 
@@ -35,17 +47,21 @@ import logging
    - Resolution:
        - Keep `_stop` flag **and** special `STOP_SIGNAL` object in queues.
        - Ensure consumer breaks on `_stop` **or** STOP_SIGNAL.
-       - Use small timeout in queue.put/get to allow periodic stop check.
+       - No timeouts/polling: stop() closes the audio ring (wakes the producer) and sets the
+         consumer's event after clearing its deque, so every blocked thread wakes exactly once.
        - Add `stream.stop()` and `stream.close()` in stop() and at end of consumer to release audio resources.
        - Proper thread join with small timeout after stop.
 
 5. Pausing then quitting caused hang
    - Cause: Consumer stuck in paused loop.
    - Resolution: Always check `_stop` inside pause loop; break instead of continue when stopping.
+   - Pause is a `threading.Event` (`_resume`) instead of a sleep loop; stop() sets it so paused threads wake.
 
 6. Logging to file affecting shutdown
    - Cause: Buffered writes can block if daemon threads exit abruptly.
    - Resolution: Use proper stop & close logic; daemon=False for threads to allow graceful shutdown; flush logs before exit.
+   - Root logger only has a QueueHandler; a QueueListener thread owns the console/file handlers,
+     so producer/consumer never do disk I/O themselves. `log_listener.stop()` (atexit) flushes at exit.
 
 7. Using END_LINE and STOP_SIGNAL objects
    - Use `END_LINE = object()` to signal sentence completion.
@@ -55,6 +71,8 @@ import logging
 8. Stream handling
    - Cause: Leaving `sd.OutputStream` open leads to PortAudio thread blocking Python shutdown.
    - Resolution: Explicitly call `stream.stop()` and `stream.close()` in `stop()` and at consumer thread exit.
+   - Playback is a PortAudio callback (no `stream.write()` per frame): each callback fills its whole
+     period from as many ring frames as needed, so there are no per-frame PortAudio calls to batch.
 
 9. Thread joining & daemon usage
    - Use daemon=False to ensure clean shutdown with join().
@@ -72,7 +90,9 @@ import logging
 
 # Create logger
 logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
+# Root level gates everything (and the `isEnabledFor(DEBUG)` guards in the hot loops).
+# Default INFO keeps per-frame debug work off; TTS_LOG_LEVEL=DEBUG fills debug.log again.
+logger.setLevel(os.environ.get("TTS_LOG_LEVEL", "INFO").upper())
 
 # ---- Console Handler (shows INFO and above, cleaner) ----
 console_handler = logging.StreamHandler()
@@ -83,7 +103,7 @@ console_format = logging.Formatter(
 )
 console_handler.setFormatter(console_format)
 
-# ---- File Handler (shows EVERYTHING) ----
+# ---- File Handler (shows EVERYTHING the root level lets through) ----
 file_handler = logging.FileHandler("debug.log", mode="w", encoding="utf-8")
 file_handler.setLevel(logging.DEBUG)         # save ALL logs into file
 file_format = logging.Formatter(
@@ -92,9 +112,12 @@ file_format = logging.Formatter(
 )
 file_handler.setFormatter(file_format)
 
-# ---- Add handlers to root logger ----
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+# ---- Route root logger through a queue; listener thread does formatting + disk writes ----
+log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(log_queue))
+log_listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)     # flush pending records on ANY exit (errors, Ctrl-C, q)
 
 # logging.basicConfig(
 #     level=logging.DEBUG,q
@@ -110,12 +133,47 @@ is_stopped = False
 lock = threading.Lock()
 
 # current_play_event = threading.Event()
+def extract_page_texts(pdf_path, start_page=0, end_page=None):
+    # PDFium (C++) text extraction - much faster than PyPDF2's pure-Python parser.
+    # PDFium is not thread-safe, so pages are read one after another.
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        end_page = len(pdf) if end_page is None else min(end_page, len(pdf))
+        texts = []
+        for page_index in range(start_page, end_page):
+            page = pdf[page_index]
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return texts
+    finally:
+        pdf.close()
+
+
+def count_pdf_pages(pdf_path):
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+# Sentence boundary = whitespace after . ! ? (optionally followed by up to two closing quotes /
+# brackets) when the next word starts with a capital, optionally after an opening quote / bracket.
+# Not after initials / short abbreviations ("U.S.", "J. Smith", "Mr.", "Dr.", "Mrs.") - "I." is exempt.
+# (Python lookbehinds must be fixed width, hence one per number of closing chars.)
+_SENT_RE = re.compile(
+    r'(?<!\b[A-HJ-Z]\.)(?<!\b[A-Z][a-z]\.)(?<!\bMrs\.)'
+    r'(?:(?<=[.!?])|(?<=[.!?]["\'”’)\]])|(?<=[.!?]["\'”’)\]]{2}))'
+    r'\s+(?=["\'“‘(\[]?[A-Z])'
+)
+
+
 def extract_sentences_from_pdf(pdf_path, start_page, start_line):
-    reader = PdfReader(open(pdf_path, "rb"))
-    all_sentences = []
+    page_texts = []
 
-    for page_index in range(start_page, len(reader.pages)):
-        text = reader.pages[page_index].extract_text()
+    for page_index, text in enumerate(extract_page_texts(pdf_path, start_page), start=start_page):
         if not text:
             continue
 
@@ -124,80 +182,265 @@ def extract_sentences_from_pdf(pdf_path, start_page, start_line):
         if page_index == start_page:  
             lines = lines[start_line:]   # Start from selected line
 
-        page_text = " ".join(lines)
-        sentences = page_text.replace("\n", " ").split(".")
-        all_sentences.extend([s + "." for s in sentences if s.strip()])
+        page_texts.append(" ".join(lines))
+
+    # split the whole document once, so sentences running across pages stay whole
+    all_sentences = []
+    for s in _SENT_RE.split(" ".join(page_texts)):
+        s = s.strip()
+        if s:
+            # ending punctuation may sit inside closing quotes / brackets: “Done.”
+            ends_ok = s.rstrip("\"'”’)]")[-1:] in (".", "!", "?")
+            all_sentences.append(s if ends_ok else s + ".")
 
     return all_sentences
 
 
 
 def display(msg):
+    _debug = logger.isEnabledFor(logging.DEBUG)
     print("======================================================================================================")
-    logging.debug(f"CURRENT THREAD = {threading.current_thread().name} , [DEBUG] {msg}")
+    if _debug:
+        logging.debug("CURRENT THREAD = %s , [DEBUG] %s", threading.current_thread().name, msg)
     print("-------------------                   -------------------------------")
-    for t in threading.enumerate():
-        logging.debug(f"active Thread: {t.name}, Alive={t.is_alive()}")
+    if _debug:
+        for t in threading.enumerate():
+            logging.debug("active Thread: %s, Alive=%s", t.name, t.is_alive())
     print("======================================================================================================")
 
 
-def list_all_models_lang_voices(start_directory):
-    file_extension = ("json", "onnx")
-    models_present = []
-    for root, dirs, files in os.walk(start_directory):
-        # print(f"Current directory: {root}")
-        # print(f"Subdirectories: {dirs}")
-        # print(f"Files: {files}")
-        for file in files:
-            full_file_path = os.path.join(root, file)
-            #print(f"  File path: {full_file_path}")
-            if file.endswith(file_extension):
-                models_present.append(full_file_path) 
-    voice_names, languages, quality_types, full_characteristics  = [],[],[],[]
-    for model in models_present:
-        voice_name = model.split("\\")[-3]
-        lang = model.split("\\")[-4]
-        quality = model.split("\\")[-2]
-        voice_names.append(voice_name)
-        languages.append(lang)
-        quality_types.append(quality)
-        full_characteristics.append((voice_name,lang,quality))
-    full_characteristics =set(full_characteristics)
-    #print(voice_names, "\n", languages, "\n", quality_types,"\n")
-    print(*full_characteristics, sep = "\n")
+def model_tags(model_path):
+    """(lang, voice_name, quality) from .../<lang>/<voice>/<quality>/<model>.onnx, else None."""
+    p = Path(model_path)
+    if p.suffix != ".onnx" or len(p.parts) < 4:
+        return None
+    lang, voice_name, quality = p.parts[-4:-1]
+    return lang, voice_name, quality
 
-    return models_present, set(voice_names), set(languages), set(quality_types), set(full_characteristics)
 
+def list_all_models_lang_voices(start_directory):
+    # works with any path separator; expects .../<lang>/<voice>/<quality>/<model>.onnx
+    paths = [p for p in Path(start_directory).rglob("*") if p.suffix in (".onnx", ".json")]
+    models_present = [str(p) for p in paths]
+
+    full_characteristics = set()
+    for p in paths:
+        tags = model_tags(p)
+        if tags:
+            lang, voice_name, quality = tags
+            full_characteristics.add((voice_name, lang, quality))
+    voice_names = {c[0] for c in full_characteristics}
+    languages = {c[1] for c in full_characteristics}
+    quality_types = {c[2] for c in full_characteristics}
+    print(*full_characteristics, sep = "\n")
 
+    return models_present, voice_names, languages, quality_types, full_characteristics
 
 
-def choose_model(lang, voice_name, models_present):
-    chosen_model = ""
-    for model in models_present :
-        if (("_"+str(lang)+"_") in model) and (("_"+str(voice_name)+"_") in model) and (".onnx" in model):
-            chosen_model =model
-            break
+def index_models(models_present):
+    """Map (lang, voice_name) -> .onnx path, using the same directory tags as list_all_models_lang_voices."""
+    model_index = {}
+    for model in models_present:
+        tags = model_tags(model)
+        if tags is None or ".int8" in os.path.basename(model):
+            continue
+        lang, voice_name, _ = tags
+        # first match wins, same as the old linear scan; "en" and "en_US" both resolve
+        model_index.setdefault((lang, voice_name), model)
+        model_index.setdefault((lang.split("_")[0], voice_name), model)
+    return model_index
+
+
+def choose_model(lang, voice_name, model_index):
+    chosen_model = model_index.get((str(lang), str(voice_name)))
+    if chosen_model is None:
+        available = sorted({f"{l}/{v}" for l, v in model_index})
+        raise ValueError(f"No voice model found for lang={lang!r}, voice={voice_name!r}. Available: {available}")
     print("MODEL FINALIZED =====  ",chosen_model)
     return chosen_model
 
 
 
-class SimpleTTSStreamer:
-    def __init__(self, voice_model_path):
-        #self.voice = voice  # PiperVoice object
-        self.voice = PiperVoice.load(voice_model_path)
+# Tried in order; only providers present in the installed onnxruntime build are used
+PREFERRED_PROVIDERS = ['CUDAExecutionProvider', 'DmlExecutionProvider', 'CPUExecutionProvider']
+
+
+def quantize_model(onnx_path):
+    """Create (once) an int8 dynamic-quantized copy next to the fp32 model, return its path."""
+    # only MatMul weights are quantized: ConvInteger has no CPU kernel in onnxruntime 1.17
+    int8_path = os.path.splitext(onnx_path)[0] + ".int8-matmul.onnx"
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        logging.info(f"Quantizing {onnx_path} -> {int8_path}")
+        tmp_path = int8_path + ".tmp"
+        quantize_dynamic(onnx_path, tmp_path, weight_type=QuantType.QInt8, op_types_to_quantize=['MatMul'])
+        os.replace(tmp_path, int8_path)    # atomic: a crash never leaves a half-written model behind
+    return int8_path
+
+
+def load_voice(voice_model_path, quantize=True, warm_up=False):
+    """
+    Load a PiperVoice with a fully optimized ONNX Runtime session on the best provider.
+    int8 weights only help on CPU, so the quantized model is used only when no GPU provider exists.
+    warm_up=True runs one throwaway synthesis so the first real sentence doesn't pay ORT's first-run cost.
+    """
+    available = onnxruntime.get_available_providers()
+    providers = [p for p in PREFERRED_PROVIDERS if p in available]
+
+    # build the one and only session ourselves (PiperVoice.load would create a default CPU one first)
+    sess_options = onnxruntime.SessionOptions()
+    sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    session = None
+    model_path = voice_model_path
+    if quantize and providers[0] == 'CPUExecutionProvider':
+        int8_path = None
+        try:
+            int8_path = quantize_model(voice_model_path)
+            session = onnxruntime.InferenceSession(int8_path, sess_options=sess_options, providers=providers)
+            model_path = int8_path
+        except Exception as e:
+            logging.warning(f"int8 model unusable, using fp32 model: {e}")
+            # drop an unloadable int8 file so it isn't picked up again next run
+            if int8_path is not None and os.path.exists(int8_path):
+                try:
+                    os.remove(int8_path)
+                except OSError:
+                    pass
+    if session is None:
+        session = onnxruntime.InferenceSession(model_path, sess_options=sess_options, providers=providers)
+
+    # config json always sits next to the original model
+    with open(voice_model_path + ".json", "r", encoding="utf-8") as f:
+        config = PiperConfig.from_dict(json.load(f))
+
+    voice = PiperVoice(config=config, session=session)
+    voice.loaded_model_path = model_path    # fp32 or int8 file actually used (audio cache key)
+    logging.info(f"Voice loaded: {model_path} on {voice.session.get_providers()}")
+
+    if warm_up:
+        for _ in voice.synthesize("Hello."):
+            pass
+    return voice
+
+
+class SPSCRing:
+    """
+    Fixed size single-producer / single-consumer ring buffer for audio frames.
+
+    Only the producer moves `tail` and only the consumer moves `head`, so no lock
+    is needed - plain int stores are atomic under the GIL. The consumer is the
+    PortAudio callback, so it never blocks: `try_pop()` returns None when empty.
+    The producer blocks (on an Event) only while the ring is full, and the consumer
+    signals it only if it is actually waiting. `close()` wakes the producer so it can exit.
+    """
+    __slots__ = ('buf', 'cap', 'mask', 'head', 'tail', 'closed', 'not_full')
+
+    def __init__(self, capacity=128):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"Ring capacity must be a power of two, got {capacity}")
+        self.buf = [None] * capacity
+        self.cap = capacity
+        self.mask = capacity - 1
+        self.head = 0
+        self.tail = 0
+        self.closed = False
+        self.not_full = threading.Event()
+
+    def _wait_not_full(self):
+        # backpressure: block only while the ring is full; False once closed
+        while self.tail - self.head == self.cap:
+            if self.closed:
+                return False
+            self.not_full.clear()
+            # re-check after clear so a pop in between is not missed
+            if self.tail - self.head == self.cap and not self.closed:
+                self.not_full.wait()
+        return not self.closed
+
+    def push(self, item):
+        if not self._wait_not_full():
+            return False
+        self.buf[self.tail & self.mask] = item
+        self.tail += 1
+        return True
+
+    def push_rows(self, block, n_rows, line):
+        """
+        Push (block, row, line) for rows 0..n_rows-1, filling all free slots per pass
+        and publishing `tail` once per batch. Returns rows pushed (< n_rows if closed).
+        """
+        buf, mask = self.buf, self.mask
+        row = 0
+        while row < n_rows:
+            if not self._wait_not_full():
+                break
+            tail = self.tail
+            end = min(n_rows, row + self.cap - (tail - self.head))
+            for r in range(row, end):
+                buf[tail & mask] = (block, r, line)
+                tail += 1
+            self.tail = tail
+            row = end
+        return row
+
+    def try_pop(self):
+        if self.head == self.tail:
+            return None
+        slot = self.head & self.mask
+        item = self.buf[slot]
+        self.buf[slot] = None     # drop frame reference once consumed
+        self.head += 1
+        if not self.not_full.is_set():
+            self.not_full.set()
+        return item
+
+    def close(self):
+        self.closed = True
+        self.not_full.set()
 
+
+class SimpleTTSStreamer:
+    def __init__(self, voice_model_path, quantize=True, voice=None):
         # Queues
         self.text_queue = queue.Queue()
-        self.audio_queue = queue.Queue(maxsize=100)
+        # (text, audio) ready to play: deque + Events (same handoff as _events), at most
+        # `_prefetch_depth` sentences ahead; stop() wakes both sides with two set() calls
+        self._prefetch = collections.deque()
+        self._prefetch_depth = 2
+        self._prefetch_added = threading.Event()
+        self._prefetch_taken = threading.Event()
+        self.audio_ring = SPSCRing(capacity=128)
 
         # Control flags
-        self._paused = False
+        self._resume = threading.Event()    # cleared while paused
+        self._resume.set()
         self._stop = False
 
         self.END_LINE = object()
+        self.START_LINE = object()
         self.STOP_SIGNAL = object()
 
+        # Playback callback state (only touched on the PortAudio thread)
+        self._cb_block = None       # sentence frames block currently being played
+        self._cb_row = 0            # frame (row) of that block
+        self._cb_pos = 0            # samples of the frame already played
+        self._cb_line = None        # line the current frame belongs to
+        self._gap_left = 0          # samples of silence still owed after END_LINE
+        self._cb_samples = 0        # samples played so far = the audio clock
+        self.sentence_gap = 0.15    # seconds of silence written between sentences
+
+        # Line start / end notifications (kind, line, audio clock secs) from the callback to the consumer thread
+        # deque.append/popleft are atomic; the Event is only a wake-up, so stop() can
+        # clear + wake in one step without racing a queue mutex
+        self._events = collections.deque()
+        self._events_ready = threading.Event()
+
+        # Voice + audio output: stream is up before the first frame is produced
+        self.voice = None
+        self.stream = None
+        self.sample_rate = None
+        self._set_voice(voice_model_path, quantize=quantize, voice=voice)
 
         # Start consumer
         self.consumer_thread = threading.Thread(target=self._audio_consumer, daemon=False)
@@ -207,147 +450,223 @@ class SimpleTTSStreamer:
         self.producer_thread = threading.Thread(target=self._text_producer, daemon=False)
         self.producer_thread.start()
 
-        # Audio output
-        self.stream = None
-        self.sample_rate = 24000
-
-    # ------------------ PRODUCER ---------------------
-    def _text_producer(self):
-        frame_size = 2048
+        # Start synthesis prefetch (feeds the producer)
+        self.prefetch_thread = threading.Thread(target=self._prefetch_worker, daemon=False)
+        self.prefetch_thread.start()
 
+    # ------------------ PREFETCH (SYNTHESIS) ---------------------
+    def _prefetch_worker(self):
+        # Synthesizes sentence N+1 while sentence N is still playing
         while True:
             if self._stop:
                 break
-            logging.debug(f"Check time LINE 1 : -  { time.perf_counter()}")
             text = self.text_queue.get()   # waits for next line
-            if text is self.STOP_SIGNAL:
+            if text is self.STOP_SIGNAL or self._stop:
                 break
-            
+
             if text is None:
                 continue
-            current_line_text = text  # <<< track current line
-
-            #logging.info(f"LINE  :  {text}")
-            logging.debug(f"Check time LINE 2 : -  { time.perf_counter()}")
 
             start_time_before_gen = time.perf_counter()
-            gen = self.voice.synthesize(text)
+            result = self._synthesize_sentence(text)
             synth_time = time.perf_counter() - start_time_before_gen
-            #logging.info(f"[PROFILE] Synthesis time: {synth_time:.3f}s for text='{text}'")
-
-            logging.debug(f"Check time LINE 3 : -  { time.perf_counter()}")
-
-            for chunk in gen:
-                logging.debug(f"Check time LINE 4 : -  { time.perf_counter()}")
-                if self._stop:
-                    break
-
-                internal_setence_float_conversion_start = time.perf_counter()
-                audio_float = chunk.audio_float_array.astype(np.float32)
-
-                logging.debug(f"Check time LINE 5 : -  { time.perf_counter()}")
-
-                # Re-init stream if needed
-                if self.stream is None or chunk.sample_rate != self.sample_rate:
-                    self._init_stream(chunk.sample_rate)
-
-                logging.debug(f"Check time LINE 6 : -  { time.perf_counter()}")
-
-                # Chunk audio into frames
-                internal_setence_put_time_start = time.perf_counter()
-                internal_setence_float_conversion_time = internal_setence_put_time_start - internal_setence_float_conversion_start
-                logging.debug(f"[PROFILE] internal_setence_float_conversion_time: {internal_setence_float_conversion_time:.3f}s ")
-
-
-                for start in range(0, len(audio_float), frame_size):
-                    logging.debug(f"  Frames Produced  =  {abs(len(audio_float)/frame_size)}")
+            if result is None:      # stopped mid-synthesis
+                break
+            if logger.isEnabledFor(logging.DEBUG):
+                logging.debug("[PROFILE] Synthesis time: %.3fs for text='%s'", synth_time, text[:30])
+
+            # wait for room (clear before re-checking, so a take racing with us is not lost)
+            while len(self._prefetch) >= self._prefetch_depth and not self._stop:
+                self._prefetch_taken.clear()
+                if len(self._prefetch) >= self._prefetch_depth and not self._stop:
+                    self._prefetch_taken.wait()
+            if self._stop:
+                break
+            self._prefetch.append((text, result))
+            self._prefetch_added.set()
 
-                    logging.debug(f"Check time LINE 7 : -  { time.perf_counter()}")
-                    if self._stop:
-                        break
+    def _synthesize_sentence(self, text):
+        """Return float32 audio for `text` (at voice sample rate), from the disk cache when possible."""
+        cache_path = self._cache_dir / f"{hashlib.sha1(text.encode('utf-8')).hexdigest()}.f32.npy"
+        if cache_path.exists():
+            try:
+                # read fully here: a lazy memmap would fault its pages in on the audio callback
+                return np.load(cache_path)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Bad cache file {cache_path}, re-synthesizing: {e}")
 
-                    frame = audio_float[start:start+frame_size]
+        chunks = []
+        for chunk in self.voice.synthesize(text):
+            if self._stop:
+                return None     # don't cache a partial sentence
+            internal_setence_float_conversion_start = time.perf_counter()
+            arr = chunk.audio_float_array
+            # Piper already returns float32 for the default models - only convert if it doesn't
+            chunks.append(arr if arr.dtype == np.float32 else arr.astype(np.float32))
+            internal_setence_float_conversion_time = time.perf_counter() - internal_setence_float_conversion_start
+            if logger.isEnabledFor(logging.DEBUG):
+                logging.debug("[PROFILE] internal_setence_float_conversion_time: %.3fs ", internal_setence_float_conversion_time)
+
+        if len(chunks) == 1:
+            audio_float = chunks[0]     # usual case for one sentence, no extra copy
+        elif chunks:
+            audio_float = np.concatenate(chunks)
+        else:
+            audio_float = np.zeros(0, dtype=np.float32)
 
-                    logging.debug(f"Check time LINE 8 : -  { time.perf_counter()}")
+        if chunks:
+            tmp_path = cache_path.with_suffix(".tmp")
+            try:
+                with open(tmp_path, "wb") as f:
+                    np.save(f, audio_float)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logging.warning(f"Could not write audio cache {cache_path}: {e}")
 
-                    # respect pausing
-                    while self._paused and not self._stop:
-                        time.sleep(0.05)
+        return audio_float
 
-                    logging.debug(f"Check time LINE 9 : -  { time.perf_counter()}")
+    # ------------------ PRODUCER ---------------------
+    def _text_producer(self):
+        frame_size = 2048
 
-                    # Put into queue (backpressure)
-                    while True:
-                        logging.debug(f"Check time LINE 10 : -  { time.perf_counter()}")
-                        try:
-                            self.audio_queue.put((frame,current_line_text), timeout=0.02)
-                            break
-                        except queue.Full:
-                            if self._stop:
-                                break
-                            time.sleep(0.005)
-                        logging.debug(f"Check time LINE 11 : -  { time.perf_counter()}")
-                internal_setence_put_time_end = time.perf_counter()
-                internal_setence_put_time = internal_setence_put_time_end - internal_setence_put_time_start
-                logging.debug(f"[PROFILE] internal_setence_put_time: {internal_setence_put_time:.3f}s ")
+        while True:
+            if self._stop:
+                break
+            _debug = logger.isEnabledFor(logging.DEBUG)
+            if _debug:
+                logging.debug("Check time LINE 1 : - %s", time.perf_counter())
+            # waits for next synthesized line
+            while not self._prefetch and not self._stop:
+                self._prefetch_added.clear()
+                if not self._prefetch and not self._stop:
+                    self._prefetch_added.wait()
+            if self._stop:
+                break
+            current_line_text, audio_float = self._prefetch.popleft()  # <<< track current line
+            self._prefetch_taken.set()
+
+            if _debug:
+                logging.debug("Check time LINE 2 : - %s", time.perf_counter())
+
+            # Chunk audio into frames
+            internal_setence_put_time_start = time.perf_counter()
+
+            # One (n_frames, frame_size) view per sentence; ring slots only carry (block, row, line)
+            # so no per-frame array view is created. Short tail frame is its own 1-row block.
+            n_full = len(audio_float) // frame_size
+            frames2d = audio_float[:n_full * frame_size].reshape(n_full, frame_size)
+            tail2d = audio_float[n_full * frame_size:].reshape(1, -1)
+            n_tail = 1 if tail2d.shape[1] else 0
+            if _debug:
+                logging.debug("  Frames Produced  =  %d", n_full + n_tail)
+
+            # whole blocks are pushed in batches - no per-frame Python work in this loop
+            for block, n_rows in ((frames2d, n_full), (tail2d, n_tail)):
+                if _debug:
+                    logging.debug("Check time LINE 7 : - %s", time.perf_counter())
+
+                # respect pausing (blocks with no polling until resume() / stop())
+                self._resume.wait()
+
+                # Push into ring (backpressure handled inside push_rows)
+                if self._stop or self.audio_ring.push_rows(block, n_rows, current_line_text) < n_rows:
+                    break
+                if _debug:
+                    logging.debug("Check time LINE 11 : - %s", time.perf_counter())
+            internal_setence_put_time_end = time.perf_counter()
+            internal_setence_put_time = internal_setence_put_time_end - internal_setence_put_time_start
+            if _debug:
+                logging.debug("[PROFILE] internal_setence_put_time: %.3fs ", internal_setence_put_time)
 
             # Producer finished text, signal to consumer
             #self.audio_queue.put("END_LINE")
-            self.audio_queue.put((self.END_LINE,current_line_text))
+            self.audio_ring.push((self.END_LINE, 0, current_line_text))
+
+    # ------------------ PLAYBACK CALLBACK ---------------------
+    def _pa_callback(self, outdata, frames, time_info, status):
+        # Runs on PortAudio's audio thread: never block here, underrun -> silence
+        out = outdata[:, 0]
+        if not self._resume.is_set() or self._stop:
+            out.fill(0)
+            return
+
+        filled = 0
+        while filled < frames:
+            if self._gap_left:
+                n = min(self._gap_left, frames - filled)
+                out[filled:filled + n] = 0
+                self._gap_left -= n
+                filled += n
+                continue
+
+            block = self._cb_block
+            if block is None:
+                item = self.audio_ring.try_pop()
+                if item is None:
+                    break       # underrun, rest is zero filled below
+                block, row, line_text = item
+                if block is self.END_LINE:
+                    # pause between sentences is real silence in the stream, not a sleep,
+                    # so its length is exact and follows the output clock
+                    self._gap_left = int(self.sample_rate * self.sentence_gap)
+                    self._cb_line = None
+                    self._post_event(self.END_LINE, line_text, (self._cb_samples + filled) / self.sample_rate)
+                    continue
+                # Report ONLY when the line changes
+                # (producer pushes the same string object for every frame of a line, so `is` is enough)
+                if line_text is not self._cb_line:
+                    self._cb_line = line_text
+                    self._post_event(self.START_LINE, line_text, (self._cb_samples + filled) / self.sample_rate)
+                self._cb_block = block
+                self._cb_row = row
+                self._cb_pos = 0
+
+            pos = self._cb_pos
+            n = min(block.shape[1] - pos, frames - filled)
+            out[filled:filled + n] = block[self._cb_row, pos:pos + n]
+            self._cb_pos = pos + n
+            filled += n
+            if self._cb_pos == block.shape[1]:
+                self._cb_block = None
+
+        if filled < frames:
+            out[filled:] = 0
+        self._cb_samples += frames
+
+    def _post_event(self, kind, line_text, audio_time):
+        self._events.append((kind, line_text, audio_time))
+        if not self._events_ready.is_set():
+            self._events_ready.set()
 
     # ------------------ CONSUMER ---------------------
     def _audio_consumer(self):
+        # Audio is played by _pa_callback; this thread only reports line start / end,
+        # so no logging (or any other blocking work) happens on the audio thread.
         logging.info("OUTSIE WHILE TRUE IN audio consumer")
-        last_finish_stream = time.perf_counter()
-        current_line = None
+        last_finish_stream = None
         while True:
-
-            item  = self.audio_queue.get()
-            frame, line_text = item 
             if self._stop:
-                break
-            if frame is self.STOP_SIGNAL:
                 logging.info("Consumer thread exiting now.")
                 break
-            
+            if not self._events:
+                self._events_ready.wait()
+                # clear before re-checking the deque, so an append racing with us is not lost
+                self._events_ready.clear()
+                continue
+            kind, line_text, audio_time = self._events.popleft()
 
-            if frame is self.END_LINE:
-                time.sleep(0.25)
+            if kind is self.END_LINE:
                 logging.info(f"NO FRAME --------")
-                now = time.perf_counter()
-                logging.info(f"[PROFILE] Line playback finished. Gap until next audio: {now - last_finish_stream:.3f}s")
-                last_finish_stream = now
-                current_line = None
+                last_finish_stream = audio_time
                 # line finished
                 continue
 
-            while self._paused and not self._stop:
-                time.sleep(0.05)
-            #logging.info(f"[PROFILE] Synthesis time: {synth_time:.3f}s for text='{text[:30]}...'")
-            before_stream_time = time.perf_counter()
-
-
-            # Print ONLY when the line changes
-            if line_text != current_line:
-                current_line = line_text
-                logging.info(f"\n### NOW SPEAKING ###\n{current_line}\n")
-
-            if self.stream:
-                #logging.info(f"[PROFILE] Synthesis time: {synth_time:.3f}s for text='{text[:30]}...'")
-                self.stream.write(frame)
-                after_stream_time = time.perf_counter()
-                stream_time  = after_stream_time - before_stream_time
-                logging.debug(f"[PROFILE] Stream _true : {stream_time:.3f}s ")
-            else:
-                logging.info(f"Stream =  NOOOOOO STREAM")
-        # <<< CLOSE STREAM HERE
-        if self.stream:
-            try:
-                self.stream.stop()
-                self.stream.close()
-            except Exception as e:
-                logging.error(f"Error closing stream inside consumer: {e}")
+            if last_finish_stream is not None:
+                # measured on the audio clock: sentence gap + any underrun while waiting for synthesis
+                logging.info(f"[PROFILE] Gap between lines (audio): {audio_time - last_finish_stream:.3f}s")
+            logging.info(f"\n### NOW SPEAKING ###\n{line_text}\n")
 
+        # stream is closed once, in stop(); closing it here too raced stop() on the same PortAudio stream
         logging.info("Consumer exited")
 
 
@@ -358,24 +677,42 @@ class SimpleTTSStreamer:
             self.stream.stop()
             self.stream.close()
 
+        self.sample_rate = sr
+        # PortAudio pulls frames from the ring via callback on its own thread
         self.stream = sd.OutputStream(
             samplerate=sr,
             channels=1,
             dtype='float32',
-            blocksize=0
+            blocksize=0,
+            latency='low',
+            callback=self._pa_callback
         )
         self.stream.start()
-        self.sample_rate = sr
+
+    # ------------------ VOICE ---------------------
+    def _set_voice(self, voice_model_path, quantize=True, voice=None):
+        # Called from __init__ only, before any thread starts: swapping later would mix models and
+        # cache folders mid-synthesis and leave old-rate audio in _prefetch and the ring.
+        # `voice` = an already loaded PiperVoice for voice_model_path (e.g. loaded in the background)
+        self.voice = voice if voice is not None else load_voice(voice_model_path, quantize=quantize)
+
+        # On-disk audio cache, one folder per loaded model file (key = sha1 of sentence text),
+        # so fp32 and int8 audio of the same voice never mix
+        loaded_model_path = getattr(self.voice, "loaded_model_path", voice_model_path)
+        self._cache_dir = Path(".tts_cache") / hashlib.sha1(loaded_model_path.encode("utf-8")).hexdigest()[:12]
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._init_stream(self.voice.config.sample_rate)
 
     # ------------------ PUBLIC API ---------------------
     def speak(self, text):
         self.text_queue.put(text)
 
     def pause(self):
-        self._paused = True
+        self._resume.clear()
 
     def resume(self):
-        self._paused = False
+        self._resume.set()
 
     def stop(self):
         self._stop = True
@@ -385,12 +722,20 @@ class SimpleTTSStreamer:
         #     self.stream.start()
 
         # No join here, thread will exit automatically on next chunk
-        self._paused = False
+        self._resume.set()      # paused threads wake up and see _stop
         logging.info("Clearing queues")
         with self.text_queue.mutex:
             self.text_queue.queue.clear()
-        with self.audio_queue.mutex:
-            self.audio_queue.queue.clear()
+        # wake producer waiting for synthesized audio, and prefetch worker waiting for room
+        self._prefetch.clear()
+        self._prefetch_added.set()
+        self._prefetch_taken.set()
+        # wake a producer blocked on a full ring, and the consumer, so they can exit
+        self.audio_ring.close()
+        self._events.clear()
+        self._events_ready.set()
+        # wake prefetch worker if it is idle waiting for the next line
+        self.text_queue.put(self.STOP_SIGNAL)
 
         # close audio stream if exists
         if self.stream:
@@ -426,13 +771,23 @@ if __name__ == "__main__":
     #pdf_path = r"C:\Users\Ishank\Documents\Python_projects\basic_tts\The Power of Positive Thinking - Norman Vincent Peale.pdf"
     global stop_flag, pause_flag
 
+    # Pick the model first so it can load (ONNX session + warm-up) while the user
+    # chooses a page and the PDF is parsed
+    base_model_dir = r"C:\Users\Ishank\Documents\Python_projects\basic_tts\voice_models"
+    models_present, voice_names, languages, quality_types, full_characteristics  =list_all_models_lang_voices(base_model_dir)
+    lang ='en'
+    voice_name = 'ljspeech'
+    chosen_model = choose_model(lang, voice_name, index_models(models_present))
+
+    loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice_loader")
+    voice_future = loader.submit(load_voice, chosen_model, warm_up=True)
+
     pdf_path = r"C:\Users\Ishank\Documents\Python_projects\basic_tts\data\The Power of Positive Thinking - Norman Vincent Peale.pdf"
-    reader = PdfReader(open(pdf_path, "rb"))
-    total_pages = len(reader.pages)
+    total_pages = count_pdf_pages(pdf_path)
     print(f"\nPDF has {total_pages} pages.\n")
 
     page = int(input("Enter start page (1-indexed): ")) - 1
-    text = reader.pages[page].extract_text()
+    text = extract_page_texts(pdf_path, page, page + 1)[0]
     lines = text.splitlines()
 
     print("\n--- Page Preview ---")
@@ -445,21 +800,15 @@ if __name__ == "__main__":
     sentences = extract_sentences_from_pdf(pdf_path, page, line_num)
     print(f"Total sentences to read: {len(sentences)}")
 
-
-
-    base_model_dir = r"C:\Users\Ishank\Documents\Python_projects\basic_tts\voice_models"
-    models_present, voice_names, languages, quality_types, full_characteristics  =list_all_models_lang_voices(base_model_dir)
-    lang ='en'
-    voice_name = 'ljspeech'
-    chosen_model = choose_model(lang, voice_name, models_present)
-
+    voice = voice_future.result()   # usually already done by now
+    loader.shutdown()
 
 
     #r"C:\Users\Ishank\Documents\Python_projects\basic_tts\models\en_US-amy-low.onnx"
     # player = ProfessionalPiperPlayer(chosen_model)
     # display("player_called")
     # # Start reading in a background thread
-    player = SimpleTTSStreamer(chosen_model)
+    player = SimpleTTSStreamer(chosen_model, voice=voice)
 
     # feed all lines immediately
     for i, line in enumerate(sentences):
@@ -488,6 +837,7 @@ if __name__ == "__main__":
             #reader_thread.join(0.5)
             logging.info("Joining threads")
             player.producer_thread.join(0.1)
+            player.prefetch_thread.join(0.1)
             player.consumer_thread.join(0.1)
             
             break
@@ -14,34 +14,46 @@ engine.setProperty('rate', 170)
 stop_flag = False
 pause_flag = False
 
-# def speak_sentences(sentences):
-#     global stop_flag, pause_flag
-#     for sentence in sentences:
-#         if stop_flag:
-#             break
-#         while pause_flag:
-#             time.sleep(0.1)
-
-#         cleaned = sentence.strip()
-#         if cleaned:
-#             engine.say(cleaned)
-#             engine.iterate()  # non-blocking
-
-#     engine.runAndWait()  # process all queued audio
 def speak_sentences(sentences):
     global stop_flag, pause_flag
 
-    for sentence in sentences:
-        #print("for looop 1  = ", sentence.strip())
+    # Non-blocking driver loop instead of runAndWait() per sentence: the next sentence is
+    # queued while the current one plays, so there is no full stop/start between sentences.
+    finished = [0]
+
+    def on_finished(name, completed):
+        finished[0] += 1
+
+    token = engine.connect('finished-utterance', on_finished)
+    engine.startLoop(False)
+    queued = 0
+    try:
+        for sentence in sentences:
+            #print("for looop 1  = ", sentence.strip())
+            if stop_flag:
+                break
+            cleaned = sentence.strip()
+            if not cleaned:
+                continue
+            # at most one sentence playing + one waiting, so pause/stop still react quickly
+            while (pause_flag or queued - finished[0] >= 2) and not stop_flag:
+                engine.iterate()
+                time.sleep(0.05)
+            if stop_flag:
+                break
+            engine.say(cleaned)
+            queued += 1
+            engine.iterate()  # non-blocking
+
+        # let the queued sentences finish playing
+        while finished[0] < queued and not stop_flag:
+            engine.iterate()
+            time.sleep(0.05)
         if stop_flag:
-            break
-        while pause_flag:
-            time.sleep(0.1)
-        if sentence.strip():
-            #print(sentence.strip())
-            engine.say(sentence.strip())
-            #print("saying")
-            engine.runAndWait()
+            engine.stop()
+    finally:
+        engine.endLoop()
+        engine.disconnect(token)
 
 def user_control():
     global stop_flag, pause_flag